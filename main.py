@@ -21,9 +21,19 @@ if __name__ == "__main__":
     # Imports
     import os
     import time
-    import yaml
-    import multiprocessing as mp
 
+    # Several workers each hold their own CUDA context on the same GPU; expandable
+    # segments reduce allocator fragmentation between them. Must be set before
+    # torch is imported.
+    os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'expandable_segments:True')
+
+    # torch.multiprocessing is a drop-in for the stdlib module that registers
+    # torch's shared-memory tensor reductions with the queue pickler, so audio
+    # tensors cross processes as handles instead of byte copies
+    import torch.multiprocessing as mp
+    from multiprocessing import connection as mp_connection
+
+    from ppm.config import load_yaml_cached
     from ppm.worker import WorkerProcess
     from ppm.logs import logger_process, mp_logger
 
@@ -34,7 +44,7 @@ if __name__ == "__main__":
     from ppm.network import sockets
 
     # Logger
-    log_q = mp.Manager().Queue()
+    log_q = mp.Queue()
     log_process = mp.Process(target=logger_process, name='log_process', args=(log_q, args.debug))
     log_process.start()
     print('Main and log processes started', mp.current_process().pid, log_process.pid)
@@ -48,8 +58,7 @@ if __name__ == "__main__":
         # Load config
         if not os.path.isfile(args.config_file):
             raise FileNotFoundError(f'{args.config_file} not found')
-        with open(args.config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_cached(args.config_file)
         logger.info(f'Using {args.config_file}')
 
         # Taking care of global arguments
@@ -62,7 +71,10 @@ if __name__ == "__main__":
         }
 
         # Setting up queues and events
-        exit_event, start_event = mp.Manager().Event(), mp.Manager().Event()    # will be used to send exit and start signal to processes
+        # Plain mp.Queue/mp.Event go through a pipe directly instead of proxying
+        # every call through a Manager server process, which matters on the
+        # per-chunk audio path. They are shared with workers by inheritance at start().
+        exit_event, start_event = mp.Event(), mp.Event()    # will be used to send exit and start signal to processes
         ready_events, done_events = [], []                  # used by workers to signal that they're ready or done
         for worker_key, worker in processes.items():
             # Queues
@@ -72,7 +84,7 @@ if __name__ == "__main__":
                     to = [to] if type(to) is not list else to
                     # Creating and assigning queues
                     for target_worker in to:
-                        q = mp.Manager().Queue()
+                        q = mp.Queue()
                         # Source worker
                         worker.output_queues.append(q)
                         # Target worker
@@ -83,7 +95,7 @@ if __name__ == "__main__":
 
             # Events
             worker.exit_event, worker.start_event = exit_event, start_event
-            worker.ready, worker.done = mp.Manager().Event(), mp.Manager().Event()
+            worker.ready, worker.done = mp.Event(), mp.Event()
             ready_events.append(worker.ready)
             done_events.append(worker.done)
 
@@ -94,18 +106,18 @@ if __name__ == "__main__":
             logger.info(f'{p.name}:{p.pid}')
         logger.info("All processes started.")
 
-        # Wait for workers to be ready
+        # Wait for workers to be ready (blocking waits instead of 1s polling,
+        # the start signal fires as soon as the last worker flips its event)
         logger.info("Waiting for workers to be ready.. ")
-        ready_check_count = 0
-        while any(not e.is_set() for e in ready_events) and ready_check_count <= READY_TIMEOUT:
-            ready_check_count += 1
-            time.sleep(1)
-        if ready_check_count >= READY_TIMEOUT:
-            raise TimeoutError(f'{[w.name for w in processes.values() if not w.ready.is_set()]} not ready in time.')
+        ready_deadline = time.monotonic() + READY_TIMEOUT
+        for e in ready_events:
+            if not e.wait(timeout=max(0., ready_deadline - time.monotonic())):
+                raise TimeoutError(f'{[w.name for w in processes.values() if not w.ready.is_set()]} not ready in time.')
         start_event.set()
         logger.info("All workers ready.")
 
         done_workers = set()
+        sentinels = [p.sentinel for p in processes.values()]
 
         # Run until KeyboardInterrupt
         while True:
@@ -121,7 +133,8 @@ if __name__ == "__main__":
                     if worker.done.is_set() and key not in done_workers:
                         done_workers.add(key)
                         logger.info(f"Worker {worker.name} is done.")
-                time.sleep(0.1)
+                # Blocks on the process sentinels so a dying worker wakes us immediately
+                mp_connection.wait(sentinels, timeout=0.5)
 
             except KeyboardInterrupt:
                 logger.info("Ctrl-C detected, quitting...")
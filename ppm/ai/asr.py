@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from safetensors.torch import load
 from typing import Dict, Any, Tuple, List
 
+from .. import clock
 from ..worker import WorkerProcess
 
 
@@ -55,18 +56,22 @@ class PrefixASRContext(ASRContext):
         super().__init__()
         self.prefix_size_ratio = prefix_size_ratio
         self.prefix_text = prefix_text
+        self._out: torch.Tensor | None = None   # scratch buffer for prefix+audio
 
     def contextualize(self, audio: torch.Tensor, timestamp: datetime | None):
         res, prefix = None, None
 
         # Prefix audio if relevant
         if self.is_relevant(timestamp):
-            res = torch.cat(
-                tensors=(
-                    self.audio[-int(audio.shape[0]*self.prefix_size_ratio):],
-                    audio),
-                dim=0
-            )
+            context = self.audio[-int(audio.shape[0]*self.prefix_size_ratio):]
+            total = context.shape[0] + audio.shape[0]
+            # The scratch buffer is reused across calls, which is safe because the
+            # result is consumed by the transcription before the next chunk arrives
+            if self._out is None or self._out.shape[0] != total:
+                self._out = torch.empty(total, dtype=audio.dtype)
+            self._out[:context.shape[0]] = context
+            self._out[context.shape[0]:] = audio
+            res = self._out
             prefix = self.text
 
         # Update memory
@@ -85,26 +90,52 @@ class BufferedASRContext(ASRContext):
         super().__init__()
         self.buffer_size = buffer_size
         self.current_buff_size = 0
+        self._buf: torch.Tensor | None = None   # preallocated rolling buffer
+        self._written = 0
+
+    def _write(self, audio: torch.Tensor, start: int) -> None:
+        # Writes audio at the given offset, allocating/growing the buffer if needed
+        # (sized for a full buffer of same-length chunks, grown if lengths vary)
+        end = start + audio.shape[0]
+        if self._buf is None or self._buf.shape[0] < end:
+            new_buf = torch.empty(max(end, (self.buffer_size + 1) * audio.shape[0]), dtype=audio.dtype)
+            if start > 0:
+                new_buf[:start] = self._buf[:start]
+            self._buf = new_buf
+        self._buf[start:end] = audio
+        self._written = end
 
     def contextualize(self, audio: torch.Tensor, timestamp: datetime | None):
-        res = audio
+        append = False
 
         # Contextualize audio if relevant
         if self.is_relevant(timestamp):
             if self.current_buff_size < self.buffer_size:
-                if self.audio is not None:
-                    res = torch.cat(tensors=(self.audio, audio), dim=0)
+                append = self._written > 0
                 self.current_buff_size += 1
             # Buffer full
             else:
                 self.current_buff_size = 0  # Other attributes are taken care of just after this
 
+        # Slice assignment into the rolling buffer replaces the old torch.cat,
+        # which copied the whole accumulated audio again on every chunk
+        self._write(audio, self._written if append else 0)
+        res = self._buf[:self._written]
+
         # Update memory
         self.time, self.audio = timestamp, res
 
         return res, None
 
 
+# Context implementations by config name
+_CTX_TYPES = {
+    "prefix": PrefixASRContext,
+    "buffer": BufferedASRContext,
+    None: ASRContext
+}
+
+
 @WorkerProcess.register("asr")
 class ASRWorker(WorkerProcess):
     def __init__(
@@ -115,9 +146,17 @@ class ASRWorker(WorkerProcess):
             get_speech_segments: bool = False,
             context_type: str | None = None,
             context_options: Dict[str, Any] = None,
+            backend: str = 'whisper',
+            compute_type: str = 'default',
+            compile_model: bool = False,
             **kwargs
     ):
         super().__init__(name='asr')
+        if backend not in ('whisper', 'faster-whisper'):
+            raise ValueError(f'Unknown ASR backend "{backend}", expected "whisper" or "faster-whisper"')
+        self.backend = backend
+        self.compute_type = compute_type    # only used by the faster-whisper backend
+        self.compile_model = compile_model  # only used by the whisper backend
         self.model_size = model_size
         self.decoding_options = decoding_options if decoding_options is not None else {}
         self.no_speech_max_prob = no_speech_max_prob
@@ -127,13 +166,11 @@ class ASRWorker(WorkerProcess):
         if context_options is None:
             context_options = {}
         self.context_type = context_type
-        self.context: ASRContext = {
-            "prefix": PrefixASRContext,
-            "buffer": BufferedASRContext,
-            None: ASRContext
-        }[context_type](**context_options)
+        self.context: ASRContext = _CTX_TYPES[context_type](**context_options)
+        self._buffered_context = isinstance(self.context, BufferedASRContext)
 
-        self.model: whisper.Whisper | None = None
+        self.model = None   # whisper.Whisper or faster_whisper.WhisperModel depending on backend
+        self.device: torch.device | None = None
         self.file_start_time: datetime | None = None
 
     def _transcribe(
@@ -147,6 +184,20 @@ class ASRWorker(WorkerProcess):
         # Context
         audio, prefix = self.context.contextualize(audio, timestamp)
 
+        if self.backend == 'faster-whisper':
+            # CTranslate2 backend, runs the model in fp16/int8 and does its own
+            # padding and mel computation
+            segments, _ = self.model.transcribe(
+                audio.numpy(),
+                prefix=prefix,
+                no_speech_threshold=self.no_speech_max_prob,
+                **self.decoding_options
+            )
+            segments = [{'start': s.start, 'end': s.end, 'text': s.text} for s in segments]
+            text = ''.join(s['text'] for s in segments)
+            self.context.update_text(text)
+            return text, (segments if self.get_speech_segments else [])
+
         if self.get_speech_segments:
             result = whisper.transcribe(
                 self.model,
@@ -157,13 +208,14 @@ class ASRWorker(WorkerProcess):
             return result['text'], result['segments']
 
         else:
-            # Preprocessing
-            audio = whisper.pad_or_trim(audio)
-            mel = whisper.log_mel_spectrogram(audio).to(self.model.device)
+            # Preprocessing, audio is moved to the model's device first so that the
+            # STFT runs there and the mel spectrogram needs no extra copy
+            audio = whisper.pad_or_trim(audio).to(self.device, non_blocking=True)
+            mel = whisper.log_mel_spectrogram(audio)
 
             # Update max sample len if using a context buffer
             options = self.decoding_options.copy()
-            if 'sample_len' in options and type(self.context) is BufferedASRContext:
+            if 'sample_len' in options and self._buffered_context:
                 options['sample_len'] = options['sample_len'] * (self.context.current_buff_size+1)
 
             # Model decoding
@@ -181,12 +233,26 @@ class ASRWorker(WorkerProcess):
 
     def setup(self) -> None:
         # Load model
-        self.logger.debug(f'Loading model "{self.model_size}"...')
-        if self.model_size in whisper._MODELS:
+        self.logger.debug(f'Loading model "{self.model_size}" ({self.backend})...')
+        if self.backend == 'faster-whisper':
+            from faster_whisper import WhisperModel
+            self.model = WhisperModel(self.model_size, compute_type=self.compute_type)
+        elif self.model_size in whisper._MODELS:
             self.model = whisper.load_model(self.model_size, in_memory=True)
         else:
             path = os.path.join(os.path.expanduser("~"), ".cache", "whisper", f'{self.model_size}.pt')
             self.model = whisper.load_model(path, in_memory=True)
+        if self.backend == 'whisper':
+            self.device = self.model.device
+            if self.compile_model:
+                # whisper.decode drives model.encoder/model.decoder directly (the
+                # top-level forward never runs), so those are the modules to
+                # compile. Inputs always have the same (padded) shape, so the
+                # compiled graphs are reused on every call; the dummy
+                # transcription below pays the compilation cost before the
+                # worker signals ready
+                self.model.encoder = torch.compile(self.model.encoder, mode='reduce-overhead', fullgraph=False)
+                self.model.decoder = torch.compile(self.model.decoder, mode='reduce-overhead', fullgraph=False)
 
         # Transcribing a dummy audio sample to ensure that all weights are loaded and model is truly ready
         self.logger.info('ASR model loaded, transcribing dummy sample...')
@@ -197,6 +263,8 @@ class ASRWorker(WorkerProcess):
 
     def routine(self) -> None:
         data = self.get_input()
+        if data is None:
+            return
 
         if data['command'] in ('transcribe', 'conv'):
             # If we have file_time information, we use this as a timestamp
@@ -210,7 +278,7 @@ class ASRWorker(WorkerProcess):
                     timestamp = self.file_start_time + timedelta(seconds=data['file_time'])
             # No file_time info, using regular timestamp
             else:
-                timestamp = datetime.fromisoformat(data['timestamp'])
+                timestamp = clock.to_datetime(data['timestamp'])
 
             # Transcribe
             start_time = time.time()
@@ -1,10 +1,14 @@
-import yaml
+import os
+import hashlib
+import itertools
 import logging
 import warnings
+import torch
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from typing import List
 
+from ..config import load_yaml_cached
 from ..worker import WorkerProcess
 
 # Remove warning from transformers
@@ -20,41 +24,68 @@ class FAQWorker(WorkerProcess):
             model_str: str = 'sentence-transformers/use-cmlm-multilingual',
             score_threshold: float = 0.5,
             faq_path: str = 'configs/faq/faq.yml',
+            compile_model: bool = False,
             **kwargs
     ) -> None:
         super().__init__(name='faq')
         self.faq_path = faq_path
         self.model_str = model_str
         self.threshold = score_threshold
+        self.compile_model = compile_model
 
         self.text_buffer: List[str] | str = []
         self.model: SentenceTransformer | None = None
         self.faq: List[dict] = []
         self.questions: List[str] = []
-        self.answer_index: List[int] = []
+        self.answer_index: np.ndarray | None = None
         self.Q: np.ndarray | None = None
 
     def setup(self) -> None:
         # Load file
-        with open(self.faq_path) as f:
-            self.faq = yaml.safe_load(f)
+        self.faq = load_yaml_cached(self.faq_path)
         self.logger.info(f'FAQ loaded, {len(self.faq)} QA entries.')
-        # Extract all questions and their indexes
-        self.questions, self.answer_index = [], []
-        for i, qa in enumerate(self.faq):
-            self.questions.extend(qa['questions'])
-            self.answer_index.extend([i] * len(qa['questions']))
+        # Extract all questions and their indexes (answer_index maps each question
+        # row to its QA entry, built as one contiguous int array)
+        self.questions = list(itertools.chain.from_iterable(qa['questions'] for qa in self.faq))
+        counts = np.array([len(qa['questions']) for qa in self.faq], dtype=np.int32)
+        self.answer_index = np.repeat(np.arange(len(self.faq), dtype=np.int32), counts)
 
         # Loading model
         self.model = SentenceTransformer(self.model_str)
+        if self.compile_model:
+            # Queries hit the encoder with small padded batches of a stable shape,
+            # so compiling the underlying transformer removes eager-mode overhead
+            self.model[0].auto_model = torch.compile(self.model[0].auto_model)
         self.logger.info(f'Model loaded, {self.model_str}')
 
-        # Pre-computing embedding for all questions in FAQ
-        self.Q = self.model.encode(self.questions)
-        self.logger.info(f"Questions' embeddings precomputed.")
+        # Pre-computing embedding for all questions in FAQ.
+        # Normalized, contiguous float32 rows so that the query path is a single
+        # BLAS gemv against Q instead of per-row python work.
+        # Cached on disk (as fp16, halving the file size) keyed on the model and
+        # the FAQ file content, so restarts skip the transformer forward passes.
+        key = hashlib.sha1(self.model_str.encode('utf-8'))
+        with open(self.faq_path, 'rb') as f:
+            key.update(f.read())
+        cache_path = os.path.join('.cache', f'faq_{key.hexdigest()}.npz')
+        if os.path.isfile(cache_path):
+            q16 = np.load(cache_path)['Q']
+            self.logger.info(f"Questions' embeddings loaded from {cache_path}.")
+        else:
+            q16 = self.model.encode(
+                self.questions,
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ).astype(np.float16)
+            os.makedirs('.cache', exist_ok=True)
+            np.savez(cache_path, Q=q16)
+            self.logger.info(f"Questions' embeddings precomputed.")
+        self.Q = q16.astype(np.float32, order='C')
 
     def routine(self) -> None:
         data = self.get_input()
+        if data is None:
+            return
 
         if data['command'] == 'conv':
             if data.get('asr_context_type') == 'buffer':
@@ -68,12 +99,12 @@ class FAQWorker(WorkerProcess):
             self.text_buffer = []
             if text.strip():    # Check that text is not just whitespaces
                 self.logger.debug(f'Text: {text}')
-                # Compute embeddings and similarity scores
-                x = self.model.encode(text)
-                scores = np.squeeze(x @ self.Q.T)
+                # Compute embeddings and similarity scores (cosine, Q rows are normalized)
+                x = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True).astype(np.float32)
+                scores = self.Q @ x
                 # Get best candidate
-                max_idx = np.argmax(scores)
-                ans_idx = self.answer_index[max_idx]
+                max_idx = int(scores.argmax())
+                ans_idx = int(self.answer_index[max_idx])
                 self.logger.info(f'Best candidate: "{self.questions[max_idx]}", score: {scores[max_idx]}')
 
                 if scores[max_idx] >= self.threshold:
@@ -3,6 +3,12 @@ import json
 import re
 from typing import List, Dict, Any
 
+try:
+    import orjson       # optional, 2-5x faster than stdlib json on the small streamed objects
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from ..worker import WorkerProcess
 
 # If running locally you may need to create SSH Tunnel
@@ -19,27 +25,36 @@ DEFAULT_OPTIONS = {
 }
 
 
+# Compiled once at import, remove_emojis is called on every streamed sentence chunk
+_EMOJI_RE = re.compile('['
+                       u'\U0001F600-\U0001F64F'  # emoticons
+                       u'\U0001F300-\U0001F5FF'  # symbols & pictographs
+                       u'\U0001F680-\U0001F6FF'  # transport & map symbols
+                       u'\U0001F1E0-\U0001F1FF'  # flags (iOS)
+                       u'\U00002500-\U00002BEF'  # chinese char
+                       u'\U00002702-\U000027B0'
+                       u'\U000024C2-\U0001F251'
+                       u'\U0001f926-\U0001f937'
+                       u'\U00010000-\U0010ffff'
+                       u'\u2640-\u2642'
+                       u'\u2600-\u2B55'
+                       u'\u200d'
+                       u'\u23cf'
+                       u'\u23e9'
+                       u'\u231a'
+                       u'\ufe0f'  # dingbats
+                       u'\u3030'
+                       ']+', re.UNICODE)
+
+# Special tokens to strip from LLM output, as a single alternation so one pass replaces them all
+_TOKEN_RE = re.compile(r'\*smile\*|\*giggle\*|\*wink\*|\[Inst\]?|\[/Inst\]|\n')
+
+# Sentence-boundary characters, checked once per streamed token
+_SENT_END_RE = re.compile(r'[.!?]')
+
+
 def remove_emojis(string):
-    emoj = re.compile('['
-                      u'\U0001F600-\U0001F64F'  # emoticons
-                      u'\U0001F300-\U0001F5FF'  # symbols & pictographs
-                      u'\U0001F680-\U0001F6FF'  # transport & map symbols
-                      u'\U0001F1E0-\U0001F1FF'  # flags (iOS)
-                      u'\U00002500-\U00002BEF'  # chinese char
-                      u'\U00002702-\U000027B0'
-                      u'\U000024C2-\U0001F251'
-                      u'\U0001f926-\U0001f937'
-                      u'\U00010000-\U0010ffff'
-                      u'\u2640-\u2642'
-                      u'\u2600-\u2B55'
-                      u'\u200d'
-                      u'\u23cf'
-                      u'\u23e9'
-                      u'\u231a'
-                      u'\ufe0f'  # dingbats
-                      u'\u3030'
-                      ']+', re.UNICODE)
-    return re.sub(emoj, '', string)
+    return _EMOJI_RE.sub('', string)
 
 
 @WorkerProcess.register('llm')
@@ -52,6 +67,8 @@ class LlmWorker(WorkerProcess):
             sys_prompt_path: str | None = None,
             intermediate_sys_prompt: str | None = None,
             options: dict = DEFAULT_OPTIONS,
+            max_history_turns: int | None = None,
+            keep_alive: str | int | None = None,
             **kwargs
     ) -> None:
         super().__init__(name='llm')
@@ -61,10 +78,13 @@ class LlmWorker(WorkerProcess):
         self.sys_prompt_path = sys_prompt_path
         self.intermediate_sys_prompt = intermediate_sys_prompt
         self.options = options
+        self.max_history_turns = max_history_turns
+        self.keep_alive = keep_alive
 
         self.sys_prompt: str = ''
         self.req_options: Dict[str, Any] = {}
         self.text_buffer: List[str] = []
+        self.session: requests.Session | None = None
 
     def setup(self) -> None:
         # TODO add initial connection so that model is loaded at the start of the interaction
@@ -73,8 +93,12 @@ class LlmWorker(WorkerProcess):
             with open(self.sys_prompt_path, 'r') as f:
                 self.sys_prompt = f.read()
 
+        # Persistent session so every turn reuses the same keep-alive connection
+        # instead of paying a TCP handshake per request
+        self.session = requests.Session()
+
         # Connection check
-        res = requests.get(self.ollama_url)
+        res = self.session.get(self.ollama_url)
         if not res.ok:
             raise ConnectionError('Could not connect to ollama :', res.text)
 
@@ -83,9 +107,13 @@ class LlmWorker(WorkerProcess):
             'options': self.options,
             'messages': [{'role': 'system', 'content': self.sys_prompt}]
         }
+        if self.keep_alive is not None:     # keeps the model (and its KV cache) loaded between turns
+            self.req_options['keep_alive'] = self.keep_alive
 
     def routine(self) -> None:
         data = self.get_input()
+        if data is None:
+            return
 
         if data['command'] == 'conv':
             if data.get('asr_context_type') == 'buffer':
@@ -106,17 +134,17 @@ class LlmWorker(WorkerProcess):
                 # Bot response
                 current_sentence = []
                 bot_message = []
-                with requests.Session().post(url=URL + ROUTE, json=self.req_options, stream=True) as res:
+                with self.session.post(url=self.url, json=self.req_options, stream=True) as res:
                     for line in res.iter_lines():
                         if line:
-                            line_data = json.loads(line)
+                            line_data = _json_loads(line)
                             if line_data['done']:
                                 break
                             else:
                                 text = line_data['message']['content']
                                 current_sentence.append(text)
                                 # If a sentence is over, sending it
-                                if any(char in text for char in ('.', '!', '?')):
+                                if _SENT_END_RE.search(text):
                                     sentence = ''.join(current_sentence)
                                     self.send_chunk(sentence, data['timestamp'])
                                     bot_message.append(sentence)
@@ -131,18 +159,24 @@ class LlmWorker(WorkerProcess):
 
                 # update history & log
                 self.req_options['messages'].append({'role': 'assistant', 'content': bot_message})
+                # Cap history so per-turn prompt size stays bounded over long sessions
+                # (keeps the system prompt plus the last max_history_turns exchanges)
+                if self.max_history_turns is not None:
+                    messages = self.req_options['messages']
+                    if len(messages) > 1 + 2 * self.max_history_turns:
+                        # Positive slice start: -2*turns would be -0 for 0 turns
+                        # and keep (plus duplicate the head of) the whole history
+                        self.req_options['messages'] = \
+                            [messages[0]] + messages[len(messages) - 2 * self.max_history_turns:]
                 self.logger.debug(f'User message: "{user_message}"')
                 self.logger.debug(f'LLM response: "{bot_message}"')
 
         elif data['command'] == 'conv-reset':
             self.req_options['messages'] = [{'role': 'system', 'content': self.sys_prompt}]
 
-    def send_chunk(self, text: str, timestamp: str) -> None:
+    def send_chunk(self, text: str, timestamp: int) -> None:
         # Remove special tokens & emojis
-        to_remove = ('*smile*', '*giggle*', '*wink*',
-                     '[Inst', '[Inst]', '[/Inst]', '\n')
-        for token in to_remove:
-            text = text.replace(token, '')
+        text = _TOKEN_RE.sub('', text)
         text = remove_emojis(text)
 
         # Output
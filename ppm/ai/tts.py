@@ -32,14 +32,19 @@ class TTSWorker(WorkerProcess):
         )
         self.sample_rate = sample_rate
         self.model: mimic.Mimic3TextToSpeechSystem | None = None
+        self.resampler: transforms.Resample | None = None
 
     def setup(self) -> None:
         self.model = mimic.Mimic3TextToSpeechSystem(settings=self.settings)
         self.model.preload_voice(self.settings.voice)
+        # Built once, the Resample constructor precomputes the polyphase filter kernel
+        self.resampler = transforms.Resample(22050, self.sample_rate, dtype=torch.float32)
         self.logger.debug(f'TTS model loaded. {self.settings}')
 
     def routine(self) -> None:
         data = self.get_input()
+        if data is None:
+            return
 
         if data['command'] in ('faq', 'llm'):
             if data['command'] == 'faq':
@@ -53,19 +58,16 @@ class TTSWorker(WorkerProcess):
             self.model.speak_text(text)
             results = self.model.end_utterance()
 
-            # Gather results
-            audio_arrays = []
+            # Emit each chunk as soon as it is synthesized so downstream playback
+            # starts during generation instead of waiting for the whole utterance
             for result in results:
                 if isinstance(result, mimic.AudioResult):
-                    audio_bytes = result.to_wav_bytes()
-                    audio_arrays.append(np.frombuffer(audio_bytes, dtype=np.int16))
+                    arr = np.frombuffer(result.to_wav_bytes(), dtype=np.int16)
+                    # int16 -> [-1, 1] float conversion fused with the copy
+                    audio = np.empty(arr.shape[0], dtype=np.float32)
+                    np.multiply(arr, 1.0 / 32768.0, out=audio)
+                    audio = self.resampler(torch.from_numpy(audio)).numpy()
+                    self.logger.debug(f'Audio chunk generated {audio.shape}')
+                    self.output({'command': 'tts', 'audio': audio})
                 else:
                     self.logger.debug(f'Unexpected result "{result}"')
-
-            # Concatenate results, conversion to float domain & resampling
-            audio = np.concatenate(audio_arrays, axis=0)
-            audio = audio.astype(np.float32, order='C') / 32768.0
-            audio = transforms.Resample(22050, self.sample_rate)(torch.tensor(audio)).numpy()
-
-            self.logger.debug(f'Audio generated {audio.shape}')
-            self.output({'command': 'tts', 'audio': audio})
@@ -17,6 +17,8 @@ class VADWorker(WorkerProcess):
             threshold: float = 0.3,
             n_silence: int = 3,
             sample_rate: int = 16000,
+            quantize_model: bool = False,
+            tail_windows: int = 4,
             **kwargs
     ):
         super().__init__(name='vad')
@@ -26,6 +28,8 @@ class VADWorker(WorkerProcess):
         self.threshold = threshold
         self.n_silence = n_silence
         self.sample_rate = sample_rate
+        self.quantize_model = quantize_model
+        self.tail_windows = tail_windows
 
         self.model: torch.nn.Module | None = None
         self.last_audio_vad: bool = False   # Keeps track if last audio had high VAD score
@@ -34,12 +38,29 @@ class VADWorker(WorkerProcess):
     def setup(self) -> None:
         # Load model
         self.model, _ = torch.hub.load(repo_or_dir=self.repo_str, model=self.model_str, verbose=False)
+        if self.quantize_model:
+            # Dynamic int8 quantization of the LSTM/Linear weights; this rewrites
+            # submodules so it needs the hub to return an eager nn.Module (custom
+            # repo_str), the stock TorchScript silero-vad graph cannot be rewritten
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.LSTM, torch.nn.Linear}, dtype=torch.qint8)
+        # Freeze the scripted model for inference (inlines constants and removes
+        # training-only guards); reset_states must be preserved explicitly since
+        # freezing only keeps forward by default
+        if isinstance(self.model, torch.jit.ScriptModule):
+            self.model = torch.jit.optimize_for_inference(
+                torch.jit.freeze(self.model.eval(), preserved_attrs=['reset_states']))
+        # VAD runs in well under a millisecond on one core, extra intra-op threads
+        # only contend with the other worker processes
+        torch.set_num_threads(1)
         self.logger.info(f'VAD model {self.repo_str}/{self.model_str} loaded.')
         self.last_audio_vad = False
         self.silence_count = 0
 
     def routine(self) -> None:
         data = self.get_input()
+        if data is None:
+            return
 
         # Non-audio commands passthrough
         if 'audio' not in data:
@@ -54,21 +75,25 @@ class VADWorker(WorkerProcess):
 
         timestamp, audio = data['timestamp'], data['audio']
 
-        # Run VAD on chunks of audio chunk
-        speech_probs = []
-        for i in range(0, len(audio), self.window_size):
-            chunk = audio[i: i + self.window_size]
-            if len(chunk) < self.window_size:
-                break
-            speech_prob = self.model(chunk, self.sample_rate).item()
-            speech_probs.append(speech_prob)
-        self.model.reset_states()  # reset model states after each audio
-
-        # Compute score (average of the speech_probs, we may use another technique in the future)
-        if len(speech_probs) > 0:
-            vad_score = sum(speech_probs)/len(speech_probs)
+        # Run VAD on the audio chunk, all full windows batched into a single model
+        # call (one dispatch and one sync instead of one per window), any
+        # incomplete trailing window is dropped as before
+        n_windows = len(audio) // self.window_size
+        # During continuous speech the chunk was already forwarded above and the
+        # score is only needed to detect speech end, which shows up at the end of
+        # the chunk: scoring just the trailing windows is enough and much cheaper
+        if self.last_audio_vad and n_windows > self.tail_windows:
+            audio = audio[-self.tail_windows * self.window_size:]
+            n_windows = self.tail_windows
+        if n_windows > 0:
+            windows = audio[:n_windows * self.window_size].reshape(n_windows, self.window_size)
+            # Score is the average of the per-window speech probabilities
+            # (we may use another technique in the future)
+            with torch.inference_mode():
+                vad_score = self.model(windows, self.sample_rate).mean().item()
         else:
             vad_score = 0
+        self.model.reset_states()  # reset model states after each audio
 
         if vad_score >= self.threshold:
             # Avoids sending same audio twice
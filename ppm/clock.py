@@ -0,0 +1,21 @@
+import time
+from datetime import datetime
+
+# Wall-clock anchor captured once at import; per-message timestamps then only
+# cost a monotonic clock read instead of a datetime construction + ISO
+# formatting on the hot path. Timestamps are epoch nanoseconds (plain ints),
+# so producers can stamp cheaply and consumers compare/format only when needed.
+_BASE_NS = time.time_ns() - time.monotonic_ns()
+
+
+def time_ns() -> int:
+    """Current epoch timestamp in nanoseconds, driven by the monotonic clock."""
+    return _BASE_NS + time.monotonic_ns()
+
+
+def to_datetime(timestamp_ns: int) -> datetime:
+    return datetime.fromtimestamp(timestamp_ns / 1e9)
+
+
+def isoformat(timestamp_ns: int) -> str:
+    return to_datetime(timestamp_ns).isoformat()
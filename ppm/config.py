@@ -0,0 +1,38 @@
+import os
+import json
+
+try:
+    import pylibyaml     # noqa: F401  swaps PyYAML's parser for the libyaml C loader when available
+except ImportError:
+    pass
+import yaml
+
+
+def load_yaml_cached(path: str):
+    """
+    Loads a YAML file, keeping a JSON cache next to it (<path>.cache.json) so that
+    unchanged files skip the YAML parser on subsequent runs. The cache is validated
+    against the file's mtime and size and rebuilt when stale or unreadable.
+    """
+    stat = os.stat(path)
+    cache_path = path + '.cache.json'
+
+    # Try cache
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached['mtime'] == stat.st_mtime and cached['size'] == stat.st_size:
+            return cached['data']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Parse and refresh cache (best effort, data may not be JSON-serializable)
+    with open(path, 'r') as f:
+        data = yaml.safe_load(f)
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump({'mtime': stat.st_mtime, 'size': stat.st_size, 'data': data}, f)
+    except (OSError, TypeError):
+        pass
+
+    return data
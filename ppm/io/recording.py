@@ -1,7 +1,9 @@
 import os
 import torch
 import torchaudio
+from concurrent.futures import ThreadPoolExecutor
 
+from .. import clock
 from ..worker import WorkerProcess
 
 
@@ -16,36 +18,62 @@ class RecordingWorker(WorkerProcess):
         super().__init__(name='recording')
         self.sample_rate = sample_rate
         self.buffer_size = buffer_size
-        self.chunks = None
+        self.audio_buf: torch.Tensor | None = None  # preallocated buffer filled chunk by chunk
+        self.write_ptr = 0
+        self.n_chunks = 0
         self.timestamp = None
+        self.io_pool: ThreadPoolExecutor | None = None
 
     def setup(self) -> None:
-        self.chunks = []
+        self.write_ptr, self.n_chunks = 0, 0
         self.timestamp = ""
+        # Single writer thread so WAV encoding/disk I/O never stalls routine()
+        self.io_pool = ThreadPoolExecutor(max_workers=1)
         if not (os.path.exists('recording') and os.path.isdir('recording')):
             os.mkdir('recording')
         self.logger.debug('setup done')
 
     def _save_chunks(self):
-        # Saving to file
-        audio = torch.unsqueeze(torch.cat(self.chunks, 0), 0)
-        audio_path = f'recording/{self.timestamp}.wav'
-        torchaudio.save(audio_path, audio, self.sample_rate, channels_first=True)
-        self.logger.debug(f'Saved audio in {audio_path}.')
-        # Free memory
-        del self.chunks[:]
+        # Downcast to 16-bit PCM at the file boundary (half the bytes on disk,
+        # no perceptible loss for speech); the conversion also gives the writer
+        # thread its own copy while the float buffer is reused right away
+        audio = torch.unsqueeze((self.audio_buf[:self.write_ptr].clamp(-1, 1) * 32767).to(torch.int16), 0)
+        # Timestamps travel as ints, the filename is where they become a string
+        # (once per buffer, off the hot path)
+        audio_path = f'recording/{clock.isoformat(self.timestamp)}.wav'
+        self.io_pool.submit(torchaudio.save, audio_path, audio, self.sample_rate,
+                            channels_first=True, encoding='PCM_S', bits_per_sample=16)
+        self.logger.debug(f'Saving audio in {audio_path}.')
+        # Buffer is simply reused from the start
+        self.write_ptr, self.n_chunks = 0, 0
 
     def routine(self) -> None:
         # Get chunk and save timestamp if this is the first chunk of the buffer
         data = self.get_input()
-        if len(self.chunks) == 0:
+        if data is None:
+            return
+        if self.n_chunks == 0:
             self.timestamp = data['timestamp']
-        self.chunks.append(data['audio'])
+        audio = data['audio']
+        n = audio.shape[0]
+
+        # Copy the chunk into its slice of the preallocated buffer (sized for
+        # buffer_size same-length chunks, grown if chunk lengths vary)
+        if self.audio_buf is None or self.write_ptr + n > self.audio_buf.shape[0]:
+            new_buf = torch.empty(max(self.write_ptr + n, self.buffer_size * n), dtype=audio.dtype)
+            if self.write_ptr > 0:
+                new_buf[:self.write_ptr] = self.audio_buf[:self.write_ptr]
+            self.audio_buf = new_buf
+        self.audio_buf[self.write_ptr:self.write_ptr + n] = audio
+        self.write_ptr += n
+        self.n_chunks += 1
 
         # Save in a file when buffer is full
-        if len(self.chunks) >= self.buffer_size:
+        if self.n_chunks >= self.buffer_size:
             self._save_chunks()
 
     def cleanup(self) -> None:
-        if len(self.chunks) > 0:
+        if self.write_ptr > 0:
             self._save_chunks()
+        if self.io_pool is not None:
+            self.io_pool.shutdown(wait=True)
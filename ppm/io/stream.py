@@ -5,11 +5,12 @@ import torch
 import torchaudio
 import sounddevice as sd
 import numpy as np
+import threading
 from queue import Queue
 from torchaudio import transforms
-from datetime import datetime
 from typing import Union
 
+from .. import clock
 from ..worker import WorkerProcess
 
 
@@ -32,12 +33,23 @@ class DeviceStreamWorker(WorkerProcess):
         self.command = command_mode
         self.stream_iterator = None
         self.streamer = None
+        self._mono_w: torch.Tensor | None = None    # channel-averaging weights
 
     def startup(self) -> None:
         # Build streamer
         self.streamer = torchaudio.io.StreamReader(self.src_device, format=self.audio_format)
-        self.streamer.add_basic_audio_stream(frames_per_chunk=self.segment_length, sample_rate=self.sample_rate)
+        # When the device already captures at the target rate, not asking for a
+        # sample_rate skips ffmpeg's per-chunk resampling pass entirely; a small
+        # buffer_chunk_size keeps capture latency low
+        if int(self.streamer.get_src_stream_info(0).sample_rate) == self.sample_rate:
+            self.streamer.add_basic_audio_stream(frames_per_chunk=self.segment_length, buffer_chunk_size=2)
+        else:
+            self.streamer.add_basic_audio_stream(frames_per_chunk=self.segment_length,
+                                                 sample_rate=self.sample_rate, buffer_chunk_size=2)
         self.stream_iterator = self.streamer.stream(timeout=-1, backoff=1.0)
+        # Mono mix as one (frames, C) @ (C, 1) matmul, weights precomputed once
+        n_channels = self.streamer.get_out_stream_info(0).num_channels
+        self._mono_w = torch.full((n_channels, 1), 1.0 / n_channels)
         # Log stream infos
         self.logger.debug(self.streamer.get_src_stream_info(0))
         self.logger.debug(self.streamer.get_out_stream_info(0))
@@ -47,10 +59,9 @@ class DeviceStreamWorker(WorkerProcess):
         (chunk,) = next(self.stream_iterator)
         # Convert to mono
         with torch.no_grad():
-            chunk = chunk.T.mean(dim=0)
+            chunk = (chunk @ self._mono_w).squeeze(1)
         # Output
-        timestamp = datetime.now().isoformat()
-        self.output({'command': self.command, 'timestamp': timestamp, 'audio': chunk})
+        self.output({'command': self.command, 'timestamp': clock.time_ns(), 'audio': chunk})
 
 
 @WorkerProcess.register('audio_io')
@@ -78,28 +89,48 @@ class AudioIOWorker(WorkerProcess):
         self.sample_rate = sample_rate
         self.command = command_mode
 
-        self.device_input_buffer = Queue()      # sound from input device
+        self.device_input_buffer = Queue()      # full audio chunks from the input device
         self.device_output_buffer = Queue()     # sound to be played on device
-        self.worker_output_buffer = []          # sound chunks coming from input device to be sent to next worker(s)
 
         self.stream: sd.Stream | None = None
+        self._in_bufs: list | None = None       # double buffer for input chunk accumulation
+        self._in_idx = 0
+        self._in_off = 0
+        self._silence: np.ndarray | None = None
+        self._cb_status = None                  # device status noted by the callback, logged by routine()
 
     def _callback(self, indata: np.ndarray, outdata: np.ndarray, frames: int, time, status) -> None:
         """
         Callback function called by the sounddevice.Stream.
-        Uses Worker buffers that are updated in self.routine function.
+        Copies device blocks into the current preallocated chunk buffer and hands
+        the buffer to routine() once full. The callback runs on PortAudio's
+        real-time thread, so it only memcpies: no allocation and no logging here.
         """
         if status:
-            self.logger.warning((str(status)))
-
-        self.device_input_buffer.put(indata[:])
+            self._cb_status = status
+
+        buf = self._in_bufs[self._in_idx]
+        end = self._in_off + frames
+        buf[self._in_off:end] = indata[:, 0]
+        if end == self.workers_audio_chunk_size:
+            self.device_input_buffer.put(buf)
+            # Switch to the other buffer while routine() ships this one
+            self._in_idx = 1 - self._in_idx
+            self._in_off = 0
+        else:
+            self._in_off = end
 
         try:
             outdata[:] = self.device_output_buffer.get_nowait()
         except queue.Empty:
-            outdata.fill(0.)
+            outdata[:] = self._silence
 
     def setup(self) -> None:
+        self._in_bufs = [
+            np.empty(self.workers_audio_chunk_size, dtype=np.float32),
+            np.empty(self.workers_audio_chunk_size, dtype=np.float32),
+        ]
+        self._silence = np.zeros((self.device_blocksize, 1))
         self.stream = sd.Stream(
             samplerate=self.sample_rate,
             blocksize=self.device_blocksize,
@@ -113,68 +144,45 @@ class AudioIOWorker(WorkerProcess):
         self.logger.info(f'Device stream started.')
 
     def routine(self) -> None:
+        # Device status deferred from the callback
+        if self._cb_status is not None:
+            self.logger.warning(str(self._cb_status))
+            self._cb_status = None
+
         # Device input to worker output
         try:
-            # Get from buffer
-            self.worker_output_buffer.append(
-                np.squeeze(self.device_input_buffer.get_nowait()).copy())
-
-            # Send to other workers if buffer has sufficient size
-            if len(self.worker_output_buffer)*self.device_blocksize == self.workers_audio_chunk_size:
-                data = np.concatenate(self.worker_output_buffer, axis=0)
-                self.worker_output_buffer = []
-
-                self.output({
-                    'command': self.command,
-                    'timestamp': datetime.now().isoformat(),
-                    'audio': torch.tensor(data, requires_grad=False)
-                })
+            # Full chunk accumulated by the callback. from_numpy shares the buffer
+            # zero-copy; output() then moves it to shared memory, which is the one
+            # copy that frees the buffer for reuse by the callback
+            data = self.device_input_buffer.get_nowait()
+            self.output({
+                'command': self.command,
+                'timestamp': clock.time_ns(),
+                'audio': torch.from_numpy(data)
+            })
         except queue.Empty:
             pass
 
         # Worker input to device output
         if self.input_queue is not None:
-            try:
-                data = self.get_input()
-
-                if data.get('command') == 'tts':
-                    # Data validation
-                    audio = data.get('audio')
-                    if type(audio) is torch.Tensor:
-                        audio = audio.numpy()
-                    elif type(audio) is not np.ndarray:
-                        raise ValueError(f'Bad audio received: {data}')
-
-                    # Processing & sending audio to device
-                    audio = np.expand_dims(audio, axis=1)
-                    out_arrays = []
-                    # Audio smaller than blocksize, padding with zeros
-                    if audio.shape[0] < self.device_blocksize:
-                        outdata = np.zeros((self.device_blocksize, 1))
-                        outdata[:audio.shape[0], :audio.shape[1]] = audio   # TODO remove audio shape 1 ?
-                        out_arrays.append(outdata)
-                    # Audio bigger than blocksize, sending by chunks to output
-                    elif audio.shape[0] > self.device_blocksize:
-                        # Go over audio
-                        for i in range(0, audio.shape[0] // self.device_blocksize):
-                            j = i * self.device_blocksize
-                            out_arrays.append(audio[j:j+self.device_blocksize])
-                        # Remaining with zero padding TODO is this problematic ?
-                        n_remaining_frames = audio.shape[0] % self.device_blocksize
-                        if n_remaining_frames > 0:
-                            last_chunk = np.zeros((self.device_blocksize, 1))
-                            last_chunk[:n_remaining_frames] = audio[-n_remaining_frames:]
-                            out_arrays.append(last_chunk)
-                    # Exact size
-                    else:
-                        out_arrays.append(audio)
-
-                    # Push to queue
-                    for out_array in out_arrays:
-                        self.device_output_buffer.put(out_array)
-
-            except queue.Empty:
-                pass
+            data = self.get_input(block=False)
+            if data is not None and data.get('command') == 'tts':
+                # Data validation
+                audio = data.get('audio')
+                if type(audio) is torch.Tensor:
+                    audio = audio.numpy()
+                elif type(audio) is not np.ndarray:
+                    raise ValueError(f'Bad audio received: {data}')
+
+                # Processing & sending audio to device: zero-pad once to a
+                # multiple of the blocksize and enqueue contiguous block views
+                # (subsumes the small/exact/large cases in a single path)
+                audio = np.expand_dims(audio, axis=1)
+                pad = (-audio.shape[0]) % self.device_blocksize
+                if pad:
+                    audio = np.pad(audio, ((0, pad), (0, 0)))
+                for block in audio.reshape(-1, self.device_blocksize, 1):
+                    self.device_output_buffer.put(block)
 
     def cleanup(self) -> None:
         if self.stream is not None:
@@ -195,7 +203,8 @@ class FileStreamWorker(WorkerProcess):
     ):
         super().__init__(name='file_stream')
         self.files = []
-        self.current_file_index = 0
+        self._resamplers = {}   # Resample transforms cached by (src, dst) rate
+        self.prefetch_q: Queue | None = None
         self.pause_time = pause_time
         self.path = path
         self.sample_rate = sample_rate
@@ -218,51 +227,69 @@ class FileStreamWorker(WorkerProcess):
 
         self.logger.info(f'Going through files: {self.files}')
 
-    def routine(self) -> None:
-        # Get next file
-        if self.current_file_index < len(self.files):
-            file = self.files[self.current_file_index]
+        # Prefetch thread: decodes and resamples the next file while the current
+        # one is being streamed, so there is no dead air between files
+        self.prefetch_q = Queue(maxsize=1)
+        threading.Thread(target=self._loader_loop, name='file_loader', daemon=True).start()
+
+    def _load_file(self, file: str) -> torch.Tensor:
+        audio, old_sample_rate = torchaudio.load(file)
 
+        # Resample if necessary (transforms are cached, the constructor
+        # precomputes the filter kernel so it should not run per file)
+        if old_sample_rate != self.sample_rate:
+            key = (old_sample_rate, self.sample_rate)
+            resampler = self._resamplers.get(key)
+            if resampler is None:
+                resampler = self._resamplers[key] = transforms.Resample(*key)
+            audio = resampler(audio)
+
+        # Convert to mono and/or format tensor (single gemv over the channel dim)
+        with torch.no_grad():
+            if audio.shape[0] > 1:
+                audio = torch.full((audio.shape[0],), 1.0 / audio.shape[0]) @ audio
+            else:
+                audio = torch.squeeze(audio)
+
+        return audio
+
+    def _loader_loop(self) -> None:
+        for file in self.files:
             self.logger.info(f'Loading audio file {file}')
             try:
-                audio, old_sample_rate = torchaudio.load(file)
+                audio = self._load_file(file)
             except Exception as e:
                 self.logger.warning(f'Could not load file {file}, skipping it. ({e})')
-                self.current_file_index += 1
-                return
-
-            # Resample if necessary
-            if old_sample_rate != self.sample_rate:
-                audio = transforms.Resample(old_sample_rate, self.sample_rate)(audio)
-
-            # Convert to mono and/or format tensor
-            with torch.no_grad():
-                if audio.shape[0] == 2:
-                    audio = audio.mean(dim=0)
-                else:
-                    audio = torch.squeeze(audio)
-
-            # Iterate through file
-            n_iters = audio.shape[0] // self.segment_length
-            if audio.shape[0] % self.segment_length:
-                n_iters += 1
-
-            self.logger.info(f'Streaming file {file}...')
-            for i in range(n_iters):
-                chunk = audio[i*self.segment_length:(i+1)*self.segment_length]
-
-                self.output({
-                    'command': self.command,
-                    'timestamp': datetime.now().isoformat(),
-                    'audio': chunk,
-                    'file': file,
-                    'file_time': 0.0 if i == 0 else i*self.segment_length/self.sample_rate
-                })
-                time.sleep(self.pause_time)     # Wait so that we do not overflow the queue too much
-
-            self.current_file_index += 1
-            # Send signal to reset conversation context
-            self.output({'command': 'conv-reset', 'timestamp': datetime.now().isoformat()})
+                continue
+            self.prefetch_q.put((file, audio))
+        self.prefetch_q.put(None)   # no more files
 
-        else:
+    def routine(self) -> None:
+        # Get next (prefetched) file; raises queue.Empty while the loader works
+        item = self.prefetch_q.get(timeout=0.5)
+        if item is None:
             self.done.set()
+            return
+        file, audio = item
+
+        # Zero-pad once to a multiple of segment_length and iterate rows of the
+        # reshaped tensor: the chunks are views sharing the padded storage, with
+        # no per-chunk slice arithmetic (the last chunk is now full-length)
+        pad = (-audio.shape[0]) % self.segment_length
+        if pad:
+            audio = torch.nn.functional.pad(audio, (0, pad))
+        chunks = audio.reshape(-1, self.segment_length)
+
+        self.logger.info(f'Streaming file {file}...')
+        for i, chunk in enumerate(chunks):
+            self.output({
+                'command': self.command,
+                'timestamp': clock.time_ns(),
+                'audio': chunk,
+                'file': file,
+                'file_time': 0.0 if i == 0 else i*self.segment_length/self.sample_rate
+            })
+            time.sleep(self.pause_time)     # Wait so that we do not overflow the queue too much
+
+        # Send signal to reset conversation context
+        self.output({'command': 'conv-reset', 'timestamp': clock.time_ns()})
@@ -3,9 +3,27 @@ import json
 from io import TextIOWrapper
 from datetime import datetime
 
+try:
+    import orjson       # optional, C-level serialization with native numpy/datetime support
+
+    def _dumps_line(record) -> bytes:
+        return orjson.dumps(record, default=str,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _dumps_line(record) -> bytes:
+        return (json.dumps(record, default=str) + '\n').encode('utf-8')
+
+from ppm import clock
 from ppm.worker import WorkerProcess
 
 
+def _time_part(iso: str) -> str:
+    # Time part of an ISO timestamp via a positional slice, split() allocated
+    # a list per record
+    i = iso.find('T')
+    return iso[i + 1:] if i >= 0 else iso
+
+
 @WorkerProcess.register('transcript_to_file')
 class TranscriptToFileWorker(WorkerProcess):
     def __init__(
@@ -18,10 +36,9 @@ class TranscriptToFileWorker(WorkerProcess):
         self.save_dir = save_dir
         self.save_details = save_details
         self.last_audio_file = None
-        self.details = []
-        self.save_details_count = 0
 
         self.file: TextIOWrapper | None = None
+        self.details_file = None    # binary file handle when save_details
         self.start_time: str | None = None
 
     def setup(self) -> None:
@@ -31,16 +48,19 @@ class TranscriptToFileWorker(WorkerProcess):
 
         self.start_time = datetime.now().isoformat()
         self.file = open(os.path.join(self.save_dir, f'{self.start_time}.txt'), 'w')
-
-    def _save_details(self) -> None:
-        with open(os.path.join(self.save_dir, f'{self.start_time}-details-{self.save_details_count}.json'), 'w') as f:
-            json.dump(self.details, f)
-        self.details = []
-        self.save_details_count += 1
+        if self.save_details:
+            # Line-delimited JSON appended per record: constant memory and no
+            # data loss if the session dies mid-run
+            self.details_file = open(os.path.join(self.save_dir, f'{self.start_time}-details.jsonl'), 'wb')
 
     def routine(self) -> None:
         data = self.get_input()
-        now = datetime.now().isoformat().split('T')[-1]
+        if data is None:
+            return
+        # Timestamps travel as ints and are only turned into strings here,
+        # at the file boundary
+        now = _time_part(datetime.now().isoformat())
+        timestamp = _time_part(clock.isoformat(data['timestamp']))
 
         if data['command'] == 'transcribe':
 
@@ -49,18 +69,19 @@ class TranscriptToFileWorker(WorkerProcess):
                 self.last_audio_file = data['file']
 
             self.file.write(
-                f"{data['timestamp'].split('T')[-1]} - {now}:  {data['text']}\n")
+                f"{timestamp} - {now}:  {data['text']}\n")
 
         else:
             self.file.write(
-                f"{data['timestamp'].split('T')[-1]} - {now}: * 'command': {data['command']} *\n")
+                f"{timestamp} - {now}: * 'command': {data['command']} *\n")
 
         if self.save_details:
-            self.details.append(data)
-            if len(self.details) > 100:
-                self._save_details()
+            # Audio payloads are projected out, they would only be stringified
+            # into the file and hold the tensor alive until written
+            record = {k: v for k, v in data.items() if k != 'audio'}
+            self.details_file.write(_dumps_line(record))
 
     def cleanup(self) -> None:
         self.file.close()
-        if self.save_details and len(self.details) > 0:
-            self._save_details()
+        if self.details_file is not None:
+            self.details_file.close()
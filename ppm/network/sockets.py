@@ -1,19 +1,105 @@
-import queue
-import time
+import struct
+import pickle
+import asyncio
 
 import websockets
 import websockets.sync.client
-import websockets.sync.server
 import json
-import base64
 import threading
-from datetime import datetime
 from cryptography.fernet import Fernet
 from safetensors.torch import save, load
 
+from .. import clock
 from ..worker import WorkerProcess
 from ..logs import mp_logger
 
+try:
+    import orjson       # optional, Rust serializer returning bytes directly
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _loads = json.loads
+
+
+# Websocket frames are tagged with a leading type byte so audio travels as raw
+# safetensors bytes instead of base64 inside JSON (saves the 33% base64
+# inflation and a full encode/decode pass on both ends)
+_TYPE_JSON = b'\x00'
+_TYPE_TENSOR = b'\x01'
+_TYPE_BATCH = b'\x02'      # list of command messages coalesced into one frame
+_TYPE_CMD = b'\x03'        # struct-packed {command, timestamp} message
+
+# Fixed-schema codes for the struct-packed command fast path: 10 bytes on the
+# wire instead of ~60 of JSON, and no JSON state machine on either end
+_CMD_CODES = {'transcribe': 1, 'conv': 2, 'conv-reset': 3, 'conv-silence': 4}
+_CMD_NAMES = {code: command for command, code in _CMD_CODES.items()}
+
+_BATCH_MAX = 32
+
+# Commands a client is allowed to push into the pipeline
+_VALID_COMMANDS = frozenset({'transcribe', 'conv', 'conv-reset', 'conv-silence'})
+
+
+def _drain_batch(first, input_queue):
+    """
+    Coalesces queued command messages behind `first` into one list so framing,
+    encryption (IV + HMAC per Fernet token) and the websocket send are paid once
+    per burst. Audio-carrying messages keep their own frame: the first one found
+    stops the drain and is returned separately.
+    """
+    batch, leftover = [first], None
+    while len(batch) < _BATCH_MAX and input_queue._reader.poll():
+        nxt = input_queue.get_nowait()
+        if isinstance(nxt, bytes):
+            # Pre-pickled fan-out payload, mirrors WorkerProcess.get_input
+            nxt = pickle.loads(nxt)
+        if 'audio' in nxt:
+            leftover = nxt
+            break
+        batch.append(nxt)
+    return batch, leftover
+
+
+def _encode_message(data) -> bytes:
+    if isinstance(data, list):
+        return _TYPE_BATCH + _dumps(data)
+    if (len(data) == 2 and 'command' in data and 'timestamp' in data
+            and data['command'] in _CMD_CODES and isinstance(data['timestamp'], int)):
+        return _TYPE_CMD + struct.pack('<BQ', _CMD_CODES[data['command']], data['timestamp'])
+    if 'audio' in data:
+        meta = {k: v for k, v in data.items() if k != 'audio'}
+        head = _dumps(meta)
+        blob = save({'audio': data['audio']})
+        return b''.join((_TYPE_TENSOR, len(head).to_bytes(4, 'little'), head, blob))
+    return _TYPE_JSON + _dumps(data)
+
+
+def _decode_message(raw):
+    if isinstance(raw, str):    # text frame from an older peer
+        raw = raw.encode('utf-8')
+    kind, payload = raw[:1], raw[1:]
+    if kind == _TYPE_CMD:
+        code, timestamp = struct.unpack('<BQ', payload)
+        return {'command': _CMD_NAMES[code], 'timestamp': timestamp}
+    if kind == _TYPE_TENSOR:
+        head_len = int.from_bytes(payload[:4], 'little')
+        data = _loads(payload[4:4 + head_len])
+        data['audio'] = load(payload[4 + head_len:])['audio']
+        return data
+    if kind == _TYPE_BATCH:     # decodes to a list of messages
+        return _loads(payload)
+    if kind == _TYPE_JSON:
+        return _loads(payload)
+    # No known tag: untagged JSON from an older peer, parse it whole
+    # (its first byte is part of the payload)
+    return _loads(raw)
+
 
 @WorkerProcess.register('socket_client')
 class NetworkClientWorker(WorkerProcess):
@@ -30,47 +116,66 @@ class NetworkClientWorker(WorkerProcess):
         self.f = Fernet(key.encode("ascii")) if key is not None else None
 
         self.websocket: websockets.sync.client.ClientConnection | None = None
+        self._recv_thread: threading.Thread | None = None
 
     def setup(self) -> None:
         self.websocket = websockets.sync.client.connect(f"ws://{self.host}:{self.port}")
         self.logger.info(f'Server connection established, at {self.host}:{self.port}')
+        # Dedicated reader thread: a blocking recv() wakes the instant bytes
+        # arrive, instead of a 0-timeout poll + 100 ms sleep per loop turn.
+        # Send and recv overlap freely, websockets' sync connection is
+        # thread-safe with one sender and one receiver thread.
+        self._recv_thread = threading.Thread(target=self._recv_loop, name='socket_client_recv', daemon=True)
+        self._recv_thread.start()
 
-    def routine(self) -> None:
-        # Message OUT
+    def _recv_loop(self) -> None:
+        # Message IN, runs until the connection closes.
+        # Bound methods hoisted out of the per-message loop.
+        recv = self.websocket.recv
+        decrypt = self.f.decrypt if self.f is not None else None
+        output = self.output
+        is_exiting = self.exit_event.is_set
         try:
-            data = self.get_input()
-            # Audio
-            if 'audio' in data:
-                data['audio'] = base64.b64encode(save({'audio': data['audio']})).decode('utf-8')
-                message = json.dumps(data).encode('utf-8')
-            # Command
-            elif 'command' in data:
-                message = json.dumps(data).encode('utf-8')
-            # Bad type
-            else:
-                raise Exception(f'Bad data format sent to client_routine, {data}')
-            # Encrypt and send
-            if self.f is not None:
-                message = self.f.encrypt(message)
-            self.websocket.send(message)
-        # No message in queue
-        except queue.Empty:
-            pass
+            while not is_exiting():
+                data = recv()
+                if decrypt is not None:
+                    data = decrypt(data)
+                data = _decode_message(data)
+                for message in (data if isinstance(data, list) else (data,)):
+                    output(message)
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.info('Connection closed.')
+        except Exception as e:
+            self.logger.exception(e)
 
-        # Message IN
-        try:
-            data = self.websocket.recv(0)
-            if self.f is not None:
-                data = self.f.decrypt(data)
-            data = json.loads(data.decode('utf-8'))
-            self.output(data)
-        # No message from server
-        except TimeoutError:
-            pass
+    def routine(self) -> None:
+        # Message OUT only, message IN is handled by the reader thread; a longer
+        # block is fine here since recv no longer depends on this loop turning
+        data = self.get_input(timeout=1.0)
+        if data is None:
+            return
+        if 'audio' not in data and 'command' not in data:
+            raise Exception(f'Bad data format sent to client_routine, {data}')
+        if 'audio' in data:
+            self._send_frame(data)
+        else:
+            # Coalesce any queued command messages into the same frame
+            batch, leftover = _drain_batch(data, self.input_queue)
+            self._send_frame(batch[0] if len(batch) == 1 else batch)
+            if leftover is not None:
+                self._send_frame(leftover)
+
+    def _send_frame(self, data) -> None:
+        message = _encode_message(data)
+        if self.f is not None:
+            message = self.f.encrypt(message)
+        self.websocket.send(message)
 
     def cleanup(self) -> None:
         if self.websocket is not None:
-            self.websocket.close()
+            self.websocket.close()  # unblocks the reader thread's recv()
+        if self._recv_thread is not None:
+            self._recv_thread.join(timeout=1)
 
 
 @WorkerProcess.register('socket_server')
@@ -91,26 +196,25 @@ class NetworkServerWorker(WorkerProcess):
     def run(self) -> None:
         try:
             self.logger = mp_logger(self.log_queue)
-
-            # Launching server
             self.logger.debug('Launching socket server')
-            server = websockets.sync.server.serve(self._client_handler, self.host, self.port)
-            server_thread = threading.Thread(target=server.serve_forever)
-            server_thread.start()
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            self.logger.exception(e)
+
+    async def _main(self) -> None:
+        # Single asyncio loop: the event loop wakes on socket readiness instead
+        # of the previous sleep-polling handler + helper thread pair
+        async with websockets.serve(self._client_handler, self.host, self.port):
             self.ready.set()
             self.logger.info(f'Server ready on {self.host}:{self.port}')
-
+            # mp.Event has no awaitable interface, this short poll only gates shutdown
             while not self.exit_event.is_set():
-                try:
-                    time.sleep(0.1)
-                except KeyboardInterrupt:
-                    server.shutdown()
-                    server_thread.join(timeout=1)
-        except Exception as e:
-            self.logger.exception(e)
+                await asyncio.sleep(0.1)
 
-    def _client_handler(self, websocket):
-        start_time = datetime.now().isoformat()
+    async def _client_handler(self, websocket) -> None:
+        start_time = clock.time_ns()
 
         if self.handler_running:
             self.logger.warning('Another handler already running !')
@@ -119,59 +223,70 @@ class NetworkServerWorker(WorkerProcess):
             self.logger.info(f'New client handler running for {websocket.remote_address}')
 
         self.handler_running = True
+        recv_task = asyncio.create_task(self._recv_loop(websocket))
 
-        # Looping until KeyboardInterrupt, exit_event or client closed connection
+        # Outbound loop; the (briefly) blocking queue reads run in the default
+        # executor so the loop stays free to serve recv/send
         try:
-            while not self.exit_event.is_set():
-                try:
-                    data, binary = False, False
-
-                    # Message IN
-                    try:
-                        data = websocket.recv(0)
-                        if self.f is not None:
-                            data = self.f.decrypt(data)
-                        data = json.loads(data.decode('utf-8'))
-
-                        # load tensor
-                        if 'audio' in data:
-                            data['audio'] = load(base64.b64decode(data['audio'].encode('utf-8')))['audio']
-
-                        if data['command'] in ('transcribe', 'conv', 'conv-reset', 'conv-silence'):
-                            self.output(data)
-                    except TimeoutError:
-                        pass
-
-                    # Message OUT
-                    try:
-                        data = self.get_input()
-                        if data['timestamp'] > start_time:  # Ignoring messages from previous connection
-                            binary = json.dumps(data).encode('utf-8')
-                            if self.f is not None:
-                                binary = self.f.encrypt(binary)
-                            websocket.send(binary)
-                    except queue.Empty:
-                        pass
-
-                    # Sleep if no messages waiting on both sides
-                    if not (data or binary):
-                        time.sleep(0.1)
-
-                except KeyboardInterrupt:
-                    break
+            while not (self.exit_event.is_set() or recv_task.done()):
+                for frame in await asyncio.to_thread(self._next_frames, start_time):
+                    await websocket.send(frame)
         except websockets.exceptions.ConnectionClosedOK:
             self.logger.info('Connection closed OK.')
         except Exception as e:
             self.logger.exception(e)
         finally:
-            # Clear queues from current client's messages
+            recv_task.cancel()
+            # Clear queues from current client's messages, probing the pipe
+            # instead of raising one queue.Empty per drained message
             count = 0
             for q in (*self.output_queues, self.input_queue):
-                while True:
-                    try:
-                        q.get_nowait()
-                        count += 1
-                    except queue.Empty:
-                        break
+                while q._reader.poll():
+                    q.get_nowait()
+                    count += 1
             self.logger.debug(f'Cleaned {count} messages from queues.')
             self.handler_running = False
+
+    def _next_frames(self, start_time: int) -> list:
+        # Runs in an executor thread: blocks briefly on the input queue and
+        # returns ready-to-send (encrypted) frames
+        data = self.get_input()
+        if data is None:
+            return []
+        if 'audio' in data:
+            batch, leftover = [data], None
+        else:
+            batch, leftover = _drain_batch(data, self.input_queue)
+        # Ignoring messages from previous connection (int ns compare)
+        batch = [m for m in batch if m['timestamp'] > start_time]
+        frames = []
+        if batch:
+            frames.append(self._encode_frame(batch[0] if len(batch) == 1 else batch))
+        if leftover is not None and leftover['timestamp'] > start_time:
+            frames.append(self._encode_frame(leftover))
+        return frames
+
+    def _encode_frame(self, data) -> bytes:
+        binary = _encode_message(data)
+        if self.f is not None:
+            binary = self.f.encrypt(binary)
+        return binary
+
+    async def _recv_loop(self, websocket) -> None:
+        # Message IN, runs until the client disconnects.
+        # Bound methods hoisted out of the per-message loop.
+        decrypt = self.f.decrypt if self.f is not None else None
+        output = self.output
+        try:
+            async for data in websocket:
+                if decrypt is not None:
+                    data = decrypt(data)
+                data = _decode_message(data)
+
+                for message in (data if isinstance(data, list) else (data,)):
+                    if message['command'] in _VALID_COMMANDS:
+                        output(message)
+        except websockets.exceptions.ConnectionClosedOK:
+            self.logger.info('Connection closed OK.')
+        except Exception as e:
+            self.logger.exception(e)
@@ -1,11 +1,15 @@
 import queue
 import time
+import pickle
 import logging
-import datetime
 import multiprocessing as mp
+from multiprocessing.reduction import ForkingPickler
+import torch
+import torch.multiprocessing     # noqa: F401  registers shared-memory reductions for torch.Tensor
 from typing import Type, TypeVar, Dict, Any, List, Union
 from pprint import pprint
 
+from ppm import clock
 from ppm.logs import mp_logger
 
 
@@ -39,23 +43,20 @@ class WorkerProcess(mp.Process):
             global_config: Dict[str, Any] | None = None
     ) -> T:
 
-        if worker_config is None:
-            worker_config = {}
-        if global_config is None:
-            global_config = {}
-
-        config = global_config.copy()
-        config.update(worker_config)    # Worker conf will override global if conflict
-
-        # Ignore 'to' in config
-        if 'to' in config:
-            config.pop('to')
+        # Resolve the registry entry first so a KeyError raised inside a worker's
+        # __init__ is not mistaken for an unknown worker type
         try:
-            return WorkerProcess.registry[worker_type](**config)
+            worker_cls = WorkerProcess.registry[worker_type]
         except KeyError:
             raise KeyError(f'Could not find "{worker_type}" in registry. '
                            'Check spelling and import of corresponding module in main script.')
 
+        # Single merged dict, worker conf overrides global if conflict;
+        # 'to' describes queue wiring and is not a worker parameter
+        config = {**(global_config or {}), **(worker_config or {})}
+        config.pop('to', None)
+        return worker_cls(**config)
+
     def __init__(self, name: str | None = None, **kwargs) -> None:
         super().__init__(name=name)
         self.log_queue: mp.Queue | None = None
@@ -86,7 +87,7 @@ class WorkerProcess(mp.Process):
             self.ready.set()
 
             while not (self.start_event.is_set() or self.exit_event.is_set()):
-                time.sleep(0.1)
+                self.start_event.wait(0.1)
 
             self.startup()
 
@@ -96,9 +97,10 @@ class WorkerProcess(mp.Process):
                         if not self.done.is_set():
                             self.routine()
                         else:
-                            time.sleep(0.1)
+                            self.exit_event.wait(0.1)
                     except queue.Empty:
-                        time.sleep(0.1)
+                        # get_input already blocked for its timeout, retry right away
+                        pass
 
                 except KeyboardInterrupt:
                     break
@@ -113,11 +115,42 @@ class WorkerProcess(mp.Process):
                 self.logger.exception(e)
 
     def output(self, message: Dict[str, Any]) -> None:
-        for q in self.output_queues:
-            q.put_nowait(message)
+        # Audio tensors are moved to shared memory once so that queues only
+        # carry a handle instead of pickling the whole buffer on every hop
+        audio = message.get('audio')
+        if isinstance(audio, torch.Tensor):
+            audio.share_memory_()
+            # Tensor-bearing messages must be pickled per queue: the shared
+            # tensor reduces to a resource_sharer fd handle that is single-use,
+            # so one serialization cannot feed several consumers
+            for q in self.output_queues:
+                q.put_nowait(message)
+        elif len(self.output_queues) > 1:
+            # Fan-out: serialize the message once and hand the same bytes to
+            # every queue, instead of each put pickling the message again
+            payload = bytes(ForkingPickler.dumps(message))
+            for q in self.output_queues:
+                q.put_nowait(payload)
+        else:
+            for q in self.output_queues:
+                q.put_nowait(message)
 
-    def get_input(self) -> Dict[str, Any]:
-        return self.input_queue.get_nowait()
+    def get_input(self, block: bool = True, timeout: float | None = 0.1) -> Dict[str, Any] | None:
+        """
+        Next input message, or None if nothing arrived within the timeout.
+        Blocking (shortly) by default so workers wake the instant a message
+        arrives; workers with their own pacing (e.g. audio I/O) pass
+        block=False. The empty case is probed on the queue's pipe instead of
+        raising/catching queue.Empty on every idle tick.
+        """
+        q = self.input_queue
+        if not q._reader.poll(timeout if block else 0):
+            return None
+        message = q.get_nowait()    # safe, one consumer per queue
+        if isinstance(message, bytes):
+            # Pre-pickled fan-out payload (see output())
+            message = pickle.loads(message)
+        return message
 
 
 @WorkerProcess.register('print')
@@ -128,8 +161,12 @@ class PrintWorker(WorkerProcess):
 
     def routine(self) -> None:
         message = self.get_input()
+        if message is None:
+            return
         self.logger.info(f'Printing {message}')
-        timestamp = datetime.datetime.now().isoformat()
+        # Cheap integer timestamp, formatted (as the raw ns value) only at the
+        # stdout boundary
+        timestamp = clock.time_ns()
         if self.only_field is not None and self.only_field in message:
             print(timestamp, 'print:', message[self.only_field])
         else: